@@ -1,25 +1,26 @@
 from __future__ import annotations
 
 import asyncio
+import functools
+import html
 import os
 import posixpath
+import ssl
 from dataclasses import dataclass
 import re
 import hashlib
+import tempfile
 from pathlib import Path
-from typing import Callable, Dict, List, Optional, Set, Tuple
-from urllib.parse import urljoin, urlparse
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+from urllib.parse import ParseResult, urljoin, urlparse
 
-import cssutils
+import certifi
 import httpx
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer, Tag
 
 from .utils import slugify, ensure_unique_dir, guess_extension_from_mime, is_relative_url
 
 
-cssutils.log.setLevel("FATAL")  # silence cssutils warnings
-
-
 @dataclass
 class DownloadResult:
     product_name: str
@@ -30,6 +31,26 @@ class DownloadResult:
     counts: Dict[str, int]
 
 
+class CancelToken:
+    """
+    Per-asset cancel switch. The downloader hands one out in each "start" asset event
+    (meta["token"]) and checks `flag` between chunks; set it to True to abort that transfer.
+    """
+
+    __slots__ = ("flag",)
+
+    def __init__(self) -> None:
+        self.flag = False
+
+
+# Upper bound on simultaneous transfers (primary asset workers / CSS ref semaphore)
+MAX_CONCURRENCY = 20
+
+# Connection pool sized above MAX_CONCURRENCY so assets spread over several hosts don't queue
+CLIENT_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=50)
+CLIENT_TIMEOUT = httpx.Timeout(30.0, connect=10.0)
+
+
 ASSET_FOLDERS = {
     "img": "img",
     "js": "js",
@@ -40,13 +61,149 @@ ASSET_FOLDERS = {
 }
 
 
+@functools.lru_cache(maxsize=None)
+def _urljoin_cached(base: str, ref: str) -> str:
+    return urljoin(base, ref)
+
+
+@functools.lru_cache(maxsize=None)
+def _urlparse_cached(url: str) -> ParseResult:
+    return urlparse(url)
+
+
+def _clear_url_caches() -> None:
+    # Called at the end of each download_site run so caches don't grow across sites
+    _urljoin_cached.cache_clear()
+    _urlparse_cached.cache_clear()
+
+
+# Streamed bodies are read and written in 1 MiB chunks
+STREAM_CHUNK_SIZE = 1 << 20
+
+
+# Linux: write into an unnamed inode and link it into place once complete. Switched off for
+# the rest of the process the first time the filesystem or /proc refuses it.
+_use_tmpfile = hasattr(os, "O_TMPFILE") and os.path.isdir("/proc/self/fd")
+
+
+def _link_fd(fd: int, path: Path) -> None:
+    src = f"/proc/self/fd/{fd}"
+    try:
+        os.link(src, path, follow_symlinks=True)
+    except FileExistsError:
+        # linkat cannot replace a name; same-name assets overwrite, as with open("wb")
+        os.unlink(path)
+        os.link(src, path, follow_symlinks=True)
+
+
+def _open_part(path: Path) -> Tuple[int, Path]:
+    # Unique per transfer: two downloads resolving to the same output must not share a temp file
+    fd, part = tempfile.mkstemp(dir=path.parent, prefix=path.name + ".", suffix=".part")
+    if hasattr(os, "fchmod"):
+        os.fchmod(fd, 0o644)  # mkstemp creates 0600; saved assets stay world-readable as before
+    return fd, Path(part)
+
+
+def _copy_fd(fd: int, out: int) -> None:
+    os.lseek(fd, 0, os.SEEK_SET)
+    while True:
+        data = os.read(fd, STREAM_CHUNK_SIZE)
+        if not data:
+            break
+        _write_all(out, data)
+
+
+class _AssetFile:
+    """
+    Destination for a streamed asset that only appears at its final path once complete,
+    so a crash or cancel never leaves a truncated file behind.
+
+    On Linux the bytes go to an O_TMPFILE inode that is linked in on commit (a discarded
+    or orphaned inode simply vanishes). Elsewhere, or when O_TMPFILE/linkat is refused,
+    a uniquely named sibling "<name>.*.part" file is renamed over the target.
+    Used as a context manager: commits on normal exit, discards on error.
+    """
+
+    __slots__ = ("path", "fd", "part_path")
+
+    def __init__(self, path: Path):
+        global _use_tmpfile
+        self.path = path
+        self.part_path: Optional[Path] = None
+        self.fd = -1
+        if _use_tmpfile:
+            try:
+                self.fd = os.open(path.parent, os.O_TMPFILE | os.O_RDWR, 0o644)
+            except OSError:
+                _use_tmpfile = False
+        if self.fd < 0:
+            self.fd, self.part_path = _open_part(path)
+
+    def write(self, data: bytes) -> None:
+        _write_all(self.fd, data)
+
+    def commit(self) -> None:
+        global _use_tmpfile
+        fd, self.fd = self.fd, -1
+        try:
+            if self.part_path is None:
+                try:
+                    _link_fd(fd, self.path)
+                    return
+                except OSError:
+                    # e.g. EXDEV/EPERM under some sandboxes: copy the inode out instead
+                    _use_tmpfile = False
+                    out, self.part_path = _open_part(self.path)
+                    try:
+                        _copy_fd(fd, out)
+                    finally:
+                        os.close(out)
+            # Close before renaming (required on Windows)
+            os.close(fd)
+            fd = -1
+            try:
+                os.replace(self.part_path, self.path)
+            except OSError:
+                self.part_path.unlink(missing_ok=True)
+                raise
+        finally:
+            if fd >= 0:
+                os.close(fd)
+
+    def discard(self) -> None:
+        if self.fd < 0:
+            return
+        fd, self.fd = self.fd, -1
+        os.close(fd)
+        if self.part_path is not None:
+            try:
+                self.part_path.unlink(missing_ok=True)
+            except OSError:
+                pass
+
+    def __enter__(self) -> "_AssetFile":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is not None:
+            self.discard()
+        elif self.fd >= 0:
+            self.commit()
+
+
+def _write_all(fd: int, data: bytes) -> None:
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view):]
+
+
 def ensure_subfolders(base: Path) -> None:
     for sub in ASSET_FOLDERS.values():
         (base / sub).mkdir(parents=True, exist_ok=True)
 
 
 def normalize_filename(url: str, content_type: Optional[str]) -> str:
-    parsed = urlparse(url)
+    parsed = _urlparse_cached(url)
     path = parsed.path
     name = os.path.basename(path) or "file"
     if "." not in name:
@@ -55,7 +212,8 @@ def normalize_filename(url: str, content_type: Optional[str]) -> str:
             name += ext
     # Avoid collisions for URLs that differ only by query (e.g., Google Fonts css2)
     if parsed.query:
-        h = hashlib.sha1(parsed.query.encode("utf-8", errors="ignore")).hexdigest()[:8]
+        # Short non-cryptographic dedup hint; blake2b yields the 8 hex chars directly
+        h = hashlib.blake2b(parsed.query.encode("utf-8", errors="ignore"), digest_size=4).hexdigest()
         if "." in name:
             base, extn = name.rsplit(".", 1)
             name = f"{base}-{h}.{extn}"
@@ -64,85 +222,123 @@ def normalize_filename(url: str, content_type: Optional[str]) -> str:
     return name
 
 
+def create_ssl_context(verify_ssl: bool = True) -> ssl.SSLContext:
+    """
+    TLS context for create_client. Building one parses the CA bundle, so callers that start
+    many jobs should create it once and pass it in.
+    """
+    ctx = ssl.create_default_context(cafile=certifi.where())
+    if not verify_ssl:
+        ctx.check_hostname = False
+        ctx.verify_mode = ssl.CERT_NONE
+    # httpx only sets ALPN on contexts it builds itself; without h2 here HTTP/2 is never negotiated
+    ctx.set_alpn_protocols(["h2", "http/1.1"])
+    return ctx
+
+
+def create_client(verify_ssl: bool = True, ssl_ctx: Optional[ssl.SSLContext] = None) -> httpx.AsyncClient:
+    """HTTP client configured for cloning (HTTP/2, pooled connections, browser-like UA)."""
+    return httpx.AsyncClient(
+        http2=True,
+        limits=CLIENT_LIMITS,
+        timeout=CLIENT_TIMEOUT,
+        headers={"User-Agent": "Mozilla/5.0"},
+        verify=ssl_ctx if ssl_ctx is not None else verify_ssl,
+    )
+
+
 async def fetch_text(client: httpx.AsyncClient, url: str) -> Tuple[str, Optional[str]]:
     r = await client.get(url, follow_redirects=True, timeout=30)
     r.raise_for_status()
     return r.text, r.headers.get("content-type")
 
 
+async def fetch_page(client: httpx.AsyncClient, url: str) -> Tuple[bytes, Optional[str], Optional[str]]:
+    """Fetch the main page undecoded: (body, content-type, charset declared in the header)."""
+    r = await client.get(url, follow_redirects=True, timeout=30)
+    r.raise_for_status()
+    return r.content, r.headers.get("content-type"), r.charset_encoding
+
+
 async def fetch_bytes(client: httpx.AsyncClient, url: str) -> Tuple[bytes, Optional[str]]:
     r = await client.get(url, follow_redirects=True, timeout=None)
     r.raise_for_status()
     return r.content, r.headers.get("content-type")
 
 
-def collect_assets(soup: BeautifulSoup, base_url: str) -> Dict[str, Set[str]]:
-    assets: Dict[str, Set[str]] = {k: set() for k in ASSET_FOLDERS.keys()}
+# Tags that can reference a downloadable asset; everything else is skipped during tree walks
+ASSET_TAGS = frozenset({"img", "source", "script", "link", "video", "track", "iframe"})
+# Restricts discovery parsing to asset tags (plus <audio> so audio <source> keeps its parent)
+ASSET_STRAINER = SoupStrainer(sorted(ASSET_TAGS | {"audio"}))
 
-    # Images and <source> (picture vs video)
-    for tag in soup.find_all(["img", "source"]):
-        parent_name = tag.parent.name.lower() if tag.parent and hasattr(tag.parent, "name") and tag.parent.name else ""
-        typ = (tag.get("type") or "").lower()
-        is_video_source = (tag.name == "source" and (parent_name in {"video", "audio"} or typ.startswith("video/")))
-        if is_video_source:
-            if tag.has_attr("src"):
-                assets["video"].add(urljoin(base_url, tag.get("src")))
-            # Usually video <source> doesn't use srcset; ignore if present
-            continue
-        # Treat as image otherwise
-        if tag.has_attr("src"):
-            assets["img"].add(urljoin(base_url, tag.get("src")))
-        if tag.has_attr("srcset"):
-            parts = [p.strip() for p in tag.get("srcset").split(",") if p.strip()]
-            for p in parts:
-                u = p.split()[0]
-                assets["img"].add(urljoin(base_url, u))
-
-    # JS
-    for tag in soup.find_all("script"):
-        src = tag.get("src")
-        if src:
-            assets["js"].add(urljoin(base_url, src))
-
-    # CSS and preload
-    for tag in soup.find_all("link"):
-        rels = [r.lower() for r in (tag.get("rel") or [""])]
-        href = tag.get("href")
-        if not href:
-            continue
-        if any(r == "stylesheet" for r in rels):
-            assets["css"].add(urljoin(base_url, href))
-            continue
-        # Treat preload as CSS if as=style
-        if "preload" in rels and (tag.get("as") or "").lower() == "style":
-            assets["css"].add(urljoin(base_url, href))
-            continue
 
-    # Videos and tracks (exclude <source> here; handled above)
-    for tag in soup.find_all(["video", "track"]):
-        src = tag.get("src")
-        if src:
-            assets["video"].add(urljoin(base_url, src))
-
-    # Icons / manifests (skip preconnect, dns-prefetch, etc.)
-    for tag in soup.find_all("link"):
-        rels = [r.lower() for r in (tag.get("rel") or [])]
-        href = tag.get("href")
-        if not href:
-            continue
-        if any(r in rels for r in ["stylesheet", "preload"]):
-            continue
-        if any(r in rels for r in ["preconnect", "dns-prefetch", "prefetch", "prerender", "modulepreload"]):
-            continue
-        if any(r in rels for r in ["icon", "shortcut icon", "apple-touch-icon", "manifest"]):
-            assets["other"].add(urljoin(base_url, href))
+def _walk(soup: BeautifulSoup, visit: Callable[[Tag], None]) -> None:
+    """Visit every asset-bearing tag in a single pass over the tree."""
+    for el in soup.descendants:
+        if getattr(el, "name", None) in ASSET_TAGS:
+            visit(el)
+
 
-    # Iframes as other assets
-    for tag in soup.find_all("iframe"):
-        src = tag.get("src")
-        if src:
-            assets["other"].add(urljoin(base_url, src))
+def collect_assets(soup: BeautifulSoup, base_url: str) -> Dict[str, Set[str]]:
+    assets: Dict[str, Set[str]] = {k: set() for k in ASSET_FOLDERS.keys()}
 
+    def visit(tag: Tag) -> None:
+        name = tag.name
+        attrs = tag.attrs
+        if name == "img" or name == "source":
+            # Images and <source> (picture vs video)
+            parent = tag.parent
+            parent_name = parent.name.lower() if parent is not None and parent.name else ""
+            typ = (attrs.get("type") or "").lower()
+            is_video_source = (name == "source" and (parent_name in {"video", "audio"} or typ.startswith("video/")))
+            if is_video_source:
+                if "src" in attrs:
+                    assets["video"].add(_urljoin_cached(base_url, attrs["src"]))
+                # Usually video <source> doesn't use srcset; ignore if present
+                return
+            # Treat as image otherwise
+            if "src" in attrs:
+                assets["img"].add(_urljoin_cached(base_url, attrs["src"]))
+            if "srcset" in attrs:
+                parts = [p.strip() for p in attrs["srcset"].split(",") if p.strip()]
+                for p in parts:
+                    u = p.split()[0]
+                    assets["img"].add(_urljoin_cached(base_url, u))
+        elif name == "script":
+            # JS
+            src = attrs.get("src")
+            if src:
+                assets["js"].add(_urljoin_cached(base_url, src))
+        elif name == "link":
+            href = attrs.get("href")
+            if not href:
+                return
+            rels = [r.lower() for r in (attrs.get("rel") or [""])]
+            # CSS and preload (treat preload as CSS if as=style)
+            if "stylesheet" in rels:
+                assets["css"].add(_urljoin_cached(base_url, href))
+                return
+            if "preload" in rels:
+                if (attrs.get("as") or "").lower() == "style":
+                    assets["css"].add(_urljoin_cached(base_url, href))
+                return
+            # Icons / manifests (skip preconnect, dns-prefetch, etc.)
+            if any(r in rels for r in ["preconnect", "dns-prefetch", "prefetch", "prerender", "modulepreload"]):
+                return
+            if any(r in rels for r in ["icon", "shortcut icon", "apple-touch-icon", "manifest"]):
+                assets["other"].add(_urljoin_cached(base_url, href))
+        elif name == "video" or name == "track":
+            # Videos and tracks (<source> is handled above)
+            src = attrs.get("src")
+            if src:
+                assets["video"].add(_urljoin_cached(base_url, src))
+        elif name == "iframe":
+            # Iframes as other assets
+            src = attrs.get("src")
+            if src:
+                assets["other"].add(_urljoin_cached(base_url, src))
+
+    _walk(soup, visit)
     return assets
 
 
@@ -153,15 +349,17 @@ async def download_assets(
     progress_cb: Optional[Callable[[int, int, str], None]] = None,
     log_cb: Optional[Callable[[str], None]] = None,
     cancel_cb: Optional[Callable[[], bool]] = None,
-    asset_cb: Optional[Callable[[str, str, str, Dict[str, int | str | None]], None]] = None,
-    asset_cancel_cb: Optional[Callable[[str, str], bool]] = None,
+    asset_cb: Optional[Callable[[str, str, str, Dict[str, Any]], None]] = None,
+    workers: int = MAX_CONCURRENCY,
 ) -> Dict[str, Dict[str, str]]:
     """
     Returns mapping per type: {url: relative_local_path}
+
+    A fixed pool of `workers` tasks drains a queue of (url, kind) items, so the number of
+    live coroutines stays bounded no matter how many assets the page references.
     """
     url_to_rel_by_type: Dict[str, Dict[str, str]] = {k: {} for k in assets.keys()}
 
-    sem = asyncio.Semaphore(10)
     assets_total = sum(len(urls) for urls in assets.values())
     completed = 0
 
@@ -174,52 +372,46 @@ async def download_assets(
             if log_cb:
                 log_cb(f"Downloading [{kind}] {url}")
             # Stream the response to report progress and support per-asset cancel
-            async with sem:
-                async with client.stream("GET", url, follow_redirects=True, timeout=None) as r:
-                    r.raise_for_status()
+            async with client.stream("GET", url, follow_redirects=True, timeout=None) as r:
+                r.raise_for_status()
+                content_length = None
+                try:
+                    content_length = int(r.headers.get("content-length")) if r.headers.get("content-length") else None
+                except Exception:
                     content_length = None
-                    try:
-                        content_length = int(r.headers.get("content-length")) if r.headers.get("content-length") else None
-                    except Exception:
-                        content_length = None
-                    if asset_cb:
-                        asset_cb("start", kind, url, {"total": content_length})
-
-                    # Prepare output path
-                    ctype = r.headers.get("content-type")
-                    name = normalize_filename(url, ctype)
-                    rel = f"{ASSET_FOLDERS[kind]}/{name}"
-                    out = base_folder / rel
-                    out.parent.mkdir(parents=True, exist_ok=True)
-
-                    bytes_read = 0
-                    cancelled_midway = False
-                    try:
-                        with open(out, "wb") as f:
-                            async for chunk in r.aiter_bytes(chunk_size=65536):
-                                # Check global or per-asset cancellation
-                                if (cancel_cb and cancel_cb()) or (asset_cancel_cb and asset_cancel_cb(kind, url)):
-                                    cancelled_midway = True
-                                    break
-                                if not chunk:
-                                    continue
-                                f.write(chunk)
-                                bytes_read += len(chunk)
-                                if asset_cb:
-                                    asset_cb("progress", kind, url, {"read": bytes_read, "total": content_length})
-                    finally:
-                        if cancelled_midway:
-                            try:
-                                out.unlink(missing_ok=True)
-                            except Exception:
-                                pass
-
-                    if cancelled_midway:
+                tok = CancelToken()
+                if asset_cb:
+                    asset_cb("start", kind, url, {"total": content_length, "token": tok})
+
+                # Prepare output path
+                ctype = r.headers.get("content-type")
+                name = normalize_filename(url, ctype)
+                rel = f"{ASSET_FOLDERS[kind]}/{name}"
+                out = base_folder / rel
+                out.parent.mkdir(parents=True, exist_ok=True)
+
+                bytes_read = 0
+                cancelled_midway = False
+                with _AssetFile(out) as dest:
+                    async for chunk in r.aiter_bytes(chunk_size=STREAM_CHUNK_SIZE):
+                        # Check global or per-asset cancellation
+                        if tok.flag or (cancel_cb and cancel_cb()):
+                            cancelled_midway = True
+                            dest.discard()
+                            break
+                        if not chunk:
+                            continue
+                        dest.write(chunk)
+                        bytes_read += len(chunk)
                         if asset_cb:
-                            asset_cb("cancelled", kind, url, {})
-                        if log_cb:
-                            log_cb(f"CANCELLED during download: [{kind}] {url}")
-                        return
+                            asset_cb("progress", kind, url, {"read": bytes_read, "total": content_length})
+
+                if cancelled_midway:
+                    if asset_cb:
+                        asset_cb("cancelled", kind, url, {})
+                    if log_cb:
+                        log_cb(f"CANCELLED during download: [{kind}] {url}")
+                    return
 
             # Record mapping on success
             url_to_rel_by_type[kind][url] = rel
@@ -246,22 +438,126 @@ async def download_assets(
             if progress_cb:
                 progress_cb(completed, assets_total, "assets")
 
-    tasks = []
+    queue: asyncio.Queue[Tuple[str, str]] = asyncio.Queue()
     for kind, urls in assets.items():
         for url in urls:
-            tasks.append(asyncio.create_task(_dl(url, kind)))
+            queue.put_nowait((url, kind))
 
-    if tasks:
+    async def _worker():
+        # The queue is filled up front, so an empty queue means this worker is done
+        while True:
+            try:
+                url, kind = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            await _dl(url, kind)
+
+    if assets_total:
         if progress_cb:
             progress_cb(0, assets_total, "assets")
-        await asyncio.gather(*tasks)
+        await asyncio.gather(*(_worker() for _ in range(min(workers, assets_total))))
 
     return url_to_rel_by_type
 
 
+# url(...) refs and @import targets. @import is tried first so "@import url(x)" yields a single ref.
+# Comments (an unterminated one runs to the end) match first with no groups set, so refs
+# inside them are skipped and passed through unchanged.
+CSS_REF_RE = re.compile(
+    r"""/\*.*?(?:\*/|\Z)"""
+    r"""|@import\s+(?:url\(\s*(['"]?)([^'")]+?)\1\s*\)|(['"])([^'"]+)\3)"""
+    r"""|url\(\s*(['"]?)([^'")]+?)\5\s*\)""",
+    re.IGNORECASE | re.DOTALL,
+)
+
+
+def extract_css_refs(css_text: str) -> List[str]:
+    """Return url() and @import refs in document order (duplicates included)."""
+    refs: List[str] = []
+    for m in CSS_REF_RE.finditer(css_text):
+        ref = (m.group(2) or m.group(4) or m.group(6) or "").strip()
+        if ref:
+            refs.append(ref)
+    return refs
+
+
+def _read_css_text(path: Path) -> Optional[str]:
+    try:
+        return path.read_text(encoding="utf-8", errors="ignore")
+    except Exception:
+        try:
+            return path.read_text(encoding="latin-1", errors="ignore")
+        except Exception:
+            return None
+
+
+def _group_css_refs(css_url: str, refs: Iterable[str]) -> List[List[str]]:
+    """
+    Group a stylesheet's ref strings by the URL they resolve to (e.g. "../img/a.png" and
+    "/img/a.png"), so each file is fetched once. data: URIs are dropped. The first ref of
+    each group is the one to download with; relative refs go first so the relative-only
+    font rule still admits a file that any ref reaches relatively.
+    """
+    groups: Dict[str, List[str]] = {}
+    for ref in dict.fromkeys(refs):
+        if ref.startswith("data:"):
+            continue
+        try:
+            key = _urljoin_cached(css_url, ref)
+        except Exception:
+            key = ref
+        groups.setdefault(key, []).append(ref)
+    return [sorted(g, key=lambda r: not is_relative_url(r)) for g in groups.values()]
+
+
+def _scan_css_files(
+    css_map: Dict[str, str],
+    base_folder: Path,
+    limit_refs: Optional[int] = None,
+) -> Tuple[Dict[str, str], Dict[str, List[str]]]:
+    """
+    Read each downloaded stylesheet once and extract its refs.
+    Returns ({css_url: css_text}, {css_url: refs}); unreadable files are left out of both.
+    """
+    css_texts: Dict[str, str] = {}
+    refs_by_css: Dict[str, List[str]] = {}
+    for css_url, rel_path in css_map.items():
+        css_text = _read_css_text(base_folder / rel_path)
+        if css_text is None:
+            continue
+        refs = extract_css_refs(css_text)
+        if limit_refs is not None:
+            refs = refs[:limit_refs]
+        css_texts[css_url] = css_text
+        refs_by_css[css_url] = refs
+    return css_texts, refs_by_css
+
+
+def rewrite_css_refs(css_text: str, mapping: Dict[str, str]) -> str:
+    """
+    Rewrite url() and @import refs found in mapping in a single pass over css_text.
+    Matching is per token, so a short ref never clobbers part of a longer one.
+    """
+    if not mapping:
+        return css_text
+
+    def _sub(m: re.Match) -> str:
+        if m.lastindex is None:
+            return m.group(0)  # comment
+        if m.group(6) is not None:
+            rel = mapping.get(m.group(6).strip())
+            return f"url('{rel}')" if rel else m.group(0)
+        rel = mapping.get((m.group(2) or m.group(4)).strip())
+        return f"@import url('{rel}')" if rel else m.group(0)
+
+    return CSS_REF_RE.sub(_sub, css_text)
+
+
+_FONT_EXTS = (".woff", ".woff2", ".ttf", ".otf", ".eot")
+
+
 def is_font_url(url: str) -> bool:
-    lower = url.lower()
-    return any(lower.endswith(ext) for ext in [".woff", ".woff2", ".ttf", ".otf", ".eot"])
+    return url.lower().endswith(_FONT_EXTS)
 
 
 async def process_css_files(
@@ -273,38 +569,15 @@ async def process_css_files(
     log_cb: Optional[Callable[[str], None]] = None,
     cancel_cb: Optional[Callable[[], bool]] = None,
     limit_refs: Optional[int] = None,
-    asset_cb: Optional[Callable[[str, str, str, Dict[str, int | str | None]], None]] = None,
-    asset_cancel_cb: Optional[Callable[[str, str], bool]] = None,
+    asset_cb: Optional[Callable[[str, str, str, Dict[str, Any]], None]] = None,
+    sem: Optional[asyncio.Semaphore] = None,
 ) -> None:
     # For each CSS, parse url() and @import, download relative assets, rewrite paths
-    # First pass: count total refs for progress
-    total_refs = 0
-    for _, rel_path in css_map.items():
-        css_file_path = base_folder / rel_path
-        try:
-            css_text = css_file_path.read_text(encoding="utf-8", errors="ignore")
-        except Exception:
-            try:
-                css_text = css_file_path.read_text(encoding="latin-1", errors="ignore")
-            except Exception:
-                continue
-
-        sheet = cssutils.parseString(css_text)
-        # Count refs in this CSS
-        count_in_css = 0
-        for rule in sheet:
-            if rule.type == rule.IMPORT_RULE:
-                count_in_css += 1
-            if rule.type == rule.STYLE_RULE:
-                for prop in rule.style:
-                    if "url(" in prop.value:
-                        for part in prop.value.split("url("):
-                            if ")" in part:
-                                count_in_css += 1
-        if limit_refs is not None:
-            total_refs += min(count_in_css, limit_refs)
-        else:
-            total_refs += count_in_css
+    if sem is None:
+        sem = asyncio.Semaphore(MAX_CONCURRENCY)
+    # Single pass: read and tokenize every stylesheet once; the download loop reuses both
+    css_texts, refs_by_css = _scan_css_files(css_map, base_folder, limit_refs)
+    total_refs = sum(len(refs) for refs in refs_by_css.values())
 
     completed_refs = 0
     if progress_cb and total_refs > 0:
@@ -316,19 +589,14 @@ async def process_css_files(
                 log_cb("CANCELLED before CSS processing")
             break
         css_file_path = base_folder / rel_path
-        try:
-            css_text = css_file_path.read_text(encoding="utf-8", errors="ignore")
-        except Exception:
-            try:
-                css_text = css_file_path.read_text(encoding="latin-1", errors="ignore")
-            except Exception:
-                continue
+        css_text = css_texts.get(css_url)
+        if css_text is None:
+            continue
 
-        sheet = cssutils.parseString(css_text)
         downloaded: Dict[str, str] = {}
 
         async def download_ref(ref_url: str) -> Optional[str]:
-            abs_url = urljoin(css_url, ref_url)
+            abs_url = _urljoin_cached(css_url, ref_url)
             try:
                 if cancel_cb and cancel_cb():
                     if log_cb:
@@ -342,8 +610,9 @@ async def process_css_files(
                         total = int(r.headers.get("content-length")) if r.headers.get("content-length") else None
                     except Exception:
                         total = None
+                    tok = CancelToken()
                     if asset_cb:
-                        asset_cb("start", "css", abs_url, {"total": total})
+                        asset_cb("start", "css", abs_url, {"total": total, "token": tok})
 
                     # Decide target folder by extension heuristic
                     # Only download fonts if the original ref was relative; otherwise skip fonts
@@ -360,23 +629,20 @@ async def process_css_files(
 
                     bytes_read = 0
                     cancelled_midway = False
-                    with open(out, "wb") as f:
-                        async for chunk in r.aiter_bytes(chunk_size=65536):
-                            if (cancel_cb and cancel_cb()) or (asset_cancel_cb and asset_cancel_cb("css", abs_url)):
+                    with _AssetFile(out) as dest:
+                        async for chunk in r.aiter_bytes(chunk_size=STREAM_CHUNK_SIZE):
+                            if tok.flag or (cancel_cb and cancel_cb()):
                                 cancelled_midway = True
+                                dest.discard()
                                 break
                             if not chunk:
                                 continue
-                            f.write(chunk)
+                            dest.write(chunk)
                             bytes_read += len(chunk)
                             if asset_cb:
                                 asset_cb("progress", "css", abs_url, {"read": bytes_read, "total": total})
 
                     if cancelled_midway:
-                        try:
-                            out.unlink(missing_ok=True)
-                        except Exception:
-                            pass
                         if asset_cb:
                             asset_cb("cancelled", "css", abs_url, {})
                         if log_cb:
@@ -396,38 +662,30 @@ async def process_css_files(
                     asset_cb("error", "css", abs_url, {})
                 return None
 
-        # Collect refs
-        refs: List[str] = []
-        for rule in sheet:
-            if rule.type == rule.IMPORT_RULE:
-                href = rule.href
-                if href:
-                    refs.append(href)
-            if rule.type == rule.STYLE_RULE:
-                for prop in rule.style:
-                    if "url(" in prop.value:
-                        val = prop.value
-                        # naive extract: url(xxx)
-                        parts = val.split("url(")
-                        for part in parts[1:]:
-                            end = part.find(")")
-                            if end != -1:
-                                url_candidate = part[:end].strip("\"'")
-                                refs.append(url_candidate)
-        if limit_refs is not None:
-            refs = refs[:limit_refs]
+        refs = refs_by_css[css_url]
 
-        # Download and rewrite
-        for ref in refs:
-            if ref.startswith("data:"):
-                continue
-            rel = await download_ref(ref)
+        async def fetch_ref(group: List[str]) -> Tuple[List[str], Optional[str]]:
+            async with sem:
+                return group, await download_ref(group[0])
+
+        # Download concurrently, once per resolved URL; data: URIs and repeats count as done
+        pending = _group_css_refs(css_url, refs)
+        completed_refs += len(refs) - len(pending)
+        if progress_cb and total_refs > 0 and len(refs) > len(pending):
+            progress_cb(completed_refs, total_refs, "css-assets")
+        resolved: Dict[str, str] = {}
+        for fut in asyncio.as_completed([fetch_ref(g) for g in pending]):
+            group, rel = await fut
             if rel:
-                css_text = css_text.replace(ref, rel)
+                for ref in group:
+                    resolved[ref] = rel
             completed_refs += 1
             if progress_cb and total_refs > 0:
                 progress_cb(completed_refs, total_refs, "css-assets")
 
+        # Rewrite once every download has settled
+        css_text = rewrite_css_refs(css_text, resolved)
+
         css_file_path.write_text(css_text, encoding="utf-8", errors="ignore")
 
 
@@ -440,8 +698,8 @@ async def process_css_files_with_fallbacks(
     log_cb: Optional[Callable[[str], None]] = None,
     cancel_cb: Optional[Callable[[], bool]] = None,
     limit_refs: Optional[int] = None,
-    asset_cb: Optional[Callable[[str, str, str, Dict[str, int | str | None]], None]] = None,
-    asset_cancel_cb: Optional[Callable[[str, str], bool]] = None,
+    asset_cb: Optional[Callable[[str, str, str, Dict[str, Any]], None]] = None,
+    sem: Optional[asyncio.Semaphore] = None,
 ) -> None:
     """
     Enhanced CSS asset downloader that:
@@ -449,29 +707,11 @@ async def process_css_files_with_fallbacks(
     - Saves non-font CSS assets into a dedicated 'css_img/' folder
     - Rewrites CSS refs to local paths
     """
-    # First pass: count refs
-    total_refs = 0
-    for _, rel_path in css_map.items():
-        css_file_path = base_folder / rel_path
-        try:
-            css_text = css_file_path.read_text(encoding="utf-8", errors="ignore")
-        except Exception:
-            try:
-                css_text = css_file_path.read_text(encoding="latin-1", errors="ignore")
-            except Exception:
-                continue
-        sheet = cssutils.parseString(css_text)
-        count_in_css = 0
-        for rule in sheet:
-            if rule.type == rule.IMPORT_RULE:
-                count_in_css += 1
-            if rule.type == rule.STYLE_RULE:
-                for prop in rule.style:
-                    if "url(" in prop.value:
-                        for part in prop.value.split("url("):
-                            if ")" in part:
-                                count_in_css += 1
-        total_refs += min(count_in_css, limit_refs) if limit_refs is not None else count_in_css
+    if sem is None:
+        sem = asyncio.Semaphore(MAX_CONCURRENCY)
+    # Single pass: read and tokenize every stylesheet once; the download loop reuses both
+    css_texts, refs_by_css = _scan_css_files(css_map, base_folder, limit_refs)
+    total_refs = sum(len(refs) for refs in refs_by_css.values())
 
     completed_refs = 0
     if progress_cb and total_refs > 0:
@@ -486,36 +726,31 @@ async def process_css_files_with_fallbacks(
                 log_cb("CANCELLED before CSS processing (fallbacks)")
             break
         css_file_path = base_folder / rel_path
-        try:
-            css_text = css_file_path.read_text(encoding="utf-8", errors="ignore")
-        except Exception:
-            try:
-                css_text = css_file_path.read_text(encoding="latin-1", errors="ignore")
-            except Exception:
-                continue
+        css_text = css_texts.get(css_url)
+        if css_text is None:
+            continue
 
-        sheet = cssutils.parseString(css_text)
         downloaded: Dict[str, str] = {}
 
         async def download_ref_with_fallbacks(ref_url: str) -> Optional[str]:
             # Build absolute URL candidates
             candidates: List[str] = []
             try:
-                candidates.append(urljoin(css_url, ref_url))
+                candidates.append(_urljoin_cached(css_url, ref_url))
             except Exception:
                 pass
             try:
-                candidates.append(urljoin(page_base_url, ref_url))
+                candidates.append(_urljoin_cached(page_base_url, ref_url))
             except Exception:
                 pass
             try:
-                candidates.append(urljoin(page_host_root, ref_url))
+                candidates.append(_urljoin_cached(page_host_root, ref_url))
             except Exception:
                 pass
             try:
-                css_parsed = urlparse(css_url)
+                css_parsed = _urlparse_cached(css_url)
                 css_host_root = f"{css_parsed.scheme}://{css_parsed.netloc}/" if css_parsed.scheme and css_parsed.netloc else css_url
-                candidates.append(urljoin(css_host_root, ref_url))
+                candidates.append(_urljoin_cached(css_host_root, ref_url))
             except Exception:
                 pass
 
@@ -543,8 +778,9 @@ async def process_css_files_with_fallbacks(
                             total = int(r.headers.get("content-length")) if r.headers.get("content-length") else None
                         except Exception:
                             total = None
+                        tok = CancelToken()
                         if asset_cb:
-                            asset_cb("start", "css", abs_url, {"total": total})
+                            asset_cb("start", "css", abs_url, {"total": total, "token": tok})
 
                         # Choose folder: fonts remain in fonts/, others go to css_img/
                         # Preserve original behavior: only download fonts if the original ref was relative
@@ -565,23 +801,20 @@ async def process_css_files_with_fallbacks(
 
                         bytes_read = 0
                         cancelled_midway = False
-                        with open(out, "wb") as f:
-                            async for chunk in r.aiter_bytes(chunk_size=65536):
-                                if (cancel_cb and cancel_cb()) or (asset_cancel_cb and asset_cancel_cb("css", abs_url)):
+                        with _AssetFile(out) as dest:
+                            async for chunk in r.aiter_bytes(chunk_size=STREAM_CHUNK_SIZE):
+                                if tok.flag or (cancel_cb and cancel_cb()):
                                     cancelled_midway = True
+                                    dest.discard()
                                     break
                                 if not chunk:
                                     continue
-                                f.write(chunk)
+                                dest.write(chunk)
                                 bytes_read += len(chunk)
                                 if asset_cb:
                                     asset_cb("progress", "css", abs_url, {"read": bytes_read, "total": total})
 
                         if cancelled_midway:
-                            try:
-                                out.unlink(missing_ok=True)
-                            except Exception:
-                                pass
                             if asset_cb:
                                 asset_cb("cancelled", "css", abs_url, {})
                             if log_cb:
@@ -606,53 +839,38 @@ async def process_css_files_with_fallbacks(
                 asset_cb("error", "css", ref_url, {})
             return None
 
-        # Collect refs
-        refs: List[str] = []
-        for rule in sheet:
-            if rule.type == rule.IMPORT_RULE:
-                href = rule.href
-                if href:
-                    refs.append(href)
-            if rule.type == rule.STYLE_RULE:
-                for prop in rule.style:
-                    if "url(" in prop.value:
-                        val = prop.value
-                        parts = val.split("url(")
-                        for part in parts[1:]:
-                            end = part.find(")")
-                            if end != -1:
-                                url_candidate = part[:end].strip("\"'")
-                                refs.append(url_candidate)
-        if limit_refs is not None:
-            refs = refs[:limit_refs]
+        refs = refs_by_css[css_url]
 
-        # Download and rewrite
-        for ref in refs:
-            if ref.startswith("data:"):
-                completed_refs += 1
-                if progress_cb and total_refs > 0:
-                    progress_cb(completed_refs, total_refs, "css-assets")
-                continue
-            rel = await download_ref_with_fallbacks(ref)
+        async def fetch_ref(group: List[str]) -> Tuple[List[str], Optional[str]]:
+            async with sem:
+                return group, await download_ref_with_fallbacks(group[0])
+
+        # Download concurrently, once per resolved URL; data: URIs and repeats count as done
+        pending = _group_css_refs(css_url, refs)
+        completed_refs += len(refs) - len(pending)
+        if progress_cb and total_refs > 0 and len(refs) > len(pending):
+            progress_cb(completed_refs, total_refs, "css-assets")
+        resolved: Dict[str, str] = {}
+        for fut in asyncio.as_completed([fetch_ref(g) for g in pending]):
+            group, rel = await fut
             if rel:
-                # Compute the correct relative path from the CSS file location to the asset location
-                css_dir_posix = posixpath.dirname(rel_path.replace("\\", "/"))
-                rel_posix = rel.replace("\\", "/")
-                try:
-                    rel_from_css = posixpath.relpath(rel_posix, start=css_dir_posix or ".")
-                except Exception:
-                    rel_from_css = rel_posix
-                # Replace url(...) occurrences for this ref with url('rel_from_css')
-                # Handles url(ref), url("ref"), url('ref') with optional whitespace
-                pattern = re.compile(r"url\(\s*(['\"]?)" + re.escape(ref) + r"\1\s*\)")
-                css_text = pattern.sub("url('" + rel_from_css + "')", css_text)
-                # Also handle @import statements that may be written as @import "ref" or @import url(ref)
-                pattern_import = re.compile(r"@import\s+(?:url\(\s*)?(['\"]?)" + re.escape(ref) + r"\1\s*\)?", re.IGNORECASE)
-                css_text = pattern_import.sub("@import url('" + rel_from_css + "')", css_text)
+                for ref in group:
+                    resolved[ref] = rel
             completed_refs += 1
             if progress_cb and total_refs > 0:
                 progress_cb(completed_refs, total_refs, "css-assets")
 
+        # Rewrite once every download has settled, with paths relative to the CSS file location
+        css_dir_posix = posixpath.dirname(rel_path.replace("\\", "/"))
+        rel_from_css_by_ref: Dict[str, str] = {}
+        for ref, rel in resolved.items():
+            rel_posix = rel.replace("\\", "/")
+            try:
+                rel_from_css_by_ref[ref] = posixpath.relpath(rel_posix, start=css_dir_posix or ".")
+            except Exception:
+                rel_from_css_by_ref[ref] = rel_posix
+        css_text = rewrite_css_refs(css_text, rel_from_css_by_ref)
+
         css_file_path.write_text(css_text, encoding="utf-8", errors="ignore")
 
 
@@ -661,71 +879,74 @@ def rewrite_html_paths(
     base_url: str,
     mapping_by_type: Dict[str, Dict[str, str]],
 ) -> None:
-    # Images
-    for tag in soup.find_all(["img", "source"]):
-        if tag.has_attr("src"):
-            absu = urljoin(base_url, tag.get("src"))
-            rel = mapping_by_type["img"].get(absu)
-            if rel:
-                tag["src"] = rel
-        if tag.has_attr("srcset"):
-            parts = [p.strip() for p in tag.get("srcset").split(",") if p.strip()]
-            new_parts = []
-            for p in parts:
-                comps = p.split()
-                u = comps[0]
-                absu = urljoin(base_url, u)
-                rel = mapping_by_type["img"].get(absu)
+    img_map = mapping_by_type["img"]
+    js_map = mapping_by_type["js"]
+    css_map = mapping_by_type["css"]
+    video_map = mapping_by_type["video"]
+    other_map = mapping_by_type["other"]
+
+    def visit(tag: Tag) -> None:
+        name = tag.name
+        attrs = tag.attrs
+        if name == "img" or name == "source":
+            # Images
+            if "src" in attrs:
+                absu = _urljoin_cached(base_url, attrs["src"])
+                rel = img_map.get(absu)
                 if rel:
-                    comps[0] = rel
-                new_parts.append(" ".join(comps))
-            if new_parts:
-                tag["srcset"] = ", ".join(new_parts)
-
-    # JS
-    for tag in soup.find_all("script"):
-        src = tag.get("src")
-        if src:
-            absu = urljoin(base_url, src)
-            rel = mapping_by_type["js"].get(absu)
-            if rel:
-                tag["src"] = rel
-
-    # CSS
-    for tag in soup.find_all("link"):
-        rels = (tag.get("rel") or [""])
-        if any(r.lower() == "stylesheet" for r in rels):
-            href = tag.get("href")
+                    tag["src"] = rel
+            if "srcset" in attrs:
+                parts = [p.strip() for p in attrs["srcset"].split(",") if p.strip()]
+                new_parts = []
+                for p in parts:
+                    comps = p.split()
+                    u = comps[0]
+                    absu = _urljoin_cached(base_url, u)
+                    rel = img_map.get(absu)
+                    if rel:
+                        comps[0] = rel
+                    new_parts.append(" ".join(comps))
+                if new_parts:
+                    tag["srcset"] = ", ".join(new_parts)
+            if name == "source":
+                # Video <source>
+                src = attrs.get("src")
+                if src:
+                    r = video_map.get(_urljoin_cached(base_url, src))
+                    if r:
+                        tag["src"] = r
+        elif name == "script":
+            # JS
+            src = attrs.get("src")
+            if src:
+                rel = js_map.get(_urljoin_cached(base_url, src))
+                if rel:
+                    tag["src"] = rel
+        elif name == "link":
+            # CSS, icons, manifests
+            href = attrs.get("href")
             if href:
-                absu = urljoin(base_url, href)
-                r = mapping_by_type["css"].get(absu)
+                rels = attrs.get("rel") or [""]
+                target = css_map if any(r.lower() == "stylesheet" for r in rels) else other_map
+                r = target.get(_urljoin_cached(base_url, href))
                 if r:
                     tag["href"] = r
-        else:
-            href = tag.get("href")
-            if href:
-                absu = urljoin(base_url, href)
-                r = mapping_by_type["other"].get(absu)
+        elif name == "video" or name == "track":
+            # Video / track
+            src = attrs.get("src")
+            if src:
+                r = video_map.get(_urljoin_cached(base_url, src))
                 if r:
-                    tag["href"] = r
+                    tag["src"] = r
+        elif name == "iframe":
+            # Iframes
+            src = attrs.get("src")
+            if src:
+                r = other_map.get(_urljoin_cached(base_url, src))
+                if r:
+                    tag["src"] = r
 
-    # Video / track
-    for tag in soup.find_all(["video", "source", "track"]):
-        src = tag.get("src")
-        if src:
-            absu = urljoin(base_url, src)
-            r = mapping_by_type["video"].get(absu)
-            if r:
-                tag["src"] = r
-
-    # Iframes
-    for tag in soup.find_all("iframe"):
-        src = tag.get("src")
-        if src:
-            absu = urljoin(base_url, src)
-            r = mapping_by_type["other"].get(absu)
-            if r:
-                tag["src"] = r
+    _walk(soup, visit)
 
 
 def strip_srcset_attributes(soup: BeautifulSoup, log_cb: Optional[Callable[[str], None]] = None) -> int:
@@ -748,6 +969,9 @@ def strip_srcset_attributes(soup: BeautifulSoup, log_cb: Optional[Callable[[str]
     return removed
 
 
+_NEXTPAGE_ONCLICK_RE = re.compile(r"^\s*nextPage\(\)\s*;?\s*$")
+
+
 def strip_onclick_nextpage_attributes(soup: BeautifulSoup, log_cb: Optional[Callable[[str], None]] = None) -> int:
     """
     Remove onclick attributes whose value is exactly nextPage() (optionally with whitespace/semicolon)
@@ -755,10 +979,9 @@ def strip_onclick_nextpage_attributes(soup: BeautifulSoup, log_cb: Optional[Call
     Returns the count of removed attributes.
     """
     removed = 0
-    pattern = re.compile(r"^\s*nextPage\(\)\s*;?\s*$")
     for tag in soup.find_all(True):  # all tags
         val = tag.get("onclick")
-        if isinstance(val, str) and pattern.match(val):
+        if isinstance(val, str) and _NEXTPAGE_ONCLICK_RE.match(val):
             try:
                 del tag["onclick"]
                 removed += 1
@@ -779,10 +1002,19 @@ async def download_site(
     cancel_cb: Optional[Callable[[], bool]] = None,
     limit_per_type: Optional[int] = None,
     limit_css_refs: Optional[int] = None,
-    asset_cb: Optional[Callable[[str, str, str, Dict[str, int | str | None]], None]] = None,
-    asset_cancel_cb: Optional[Callable[[str, str], bool]] = None,
+    asset_cb: Optional[Callable[[str, str, str, Dict[str, Any]], None]] = None,
     verify_ssl: bool = True,
+    pretty_html: bool = False,
+    client: Optional[httpx.AsyncClient] = None,
+    ssl_ctx: Optional[ssl.SSLContext] = None,
 ) -> DownloadResult:
+    """
+    Clone `url` into a new folder under `download_root`.
+
+    Pass a long-lived `client` (see create_client) to reuse its connection pool across jobs;
+    it is left open. Without one, a client is created for this call (using `ssl_ctx` if given,
+    see create_ssl_context) and closed afterwards.
+    """
     # Create folder structure
     slug = slugify(product_name)
     folder = ensure_unique_dir(download_root, slug)
@@ -791,21 +1023,26 @@ async def download_site(
     index_path = folder / "index.html"
     local_index_path = folder / "local-index.html"
 
-    async with httpx.AsyncClient(headers={"User-Agent": "Mozilla/5.0", "Referer": url}, verify=verify_ssl) as client:
-        html, ctype = await fetch_text(client, url)
-        # Save the raw main page source immediately as index.html
+    own_client = client is None
+    if own_client:
+        client = create_client(verify_ssl, ssl_ctx)
+    # Referer follows the page being cloned; a shared client only runs one job at a time
+    client.headers["Referer"] = url
+    try:
+        raw_html, ctype, charset = await fetch_page(client, url)
+        # Save the raw main page source immediately as index.html (bytes as served)
         try:
-            index_path.write_text(html, encoding="utf-8")
+            index_path.write_bytes(raw_html)
             if log_cb:
                 log_cb(f"Saved main page source -> {index_path.name}")
         except Exception:
             # Best-effort; continue even if this initial write fails
             if log_cb:
                 log_cb("WARNING  failed to write raw index.html; will continue")
-        soup = BeautifulSoup(html, "html.parser")
         base_url = url
 
-        assets = collect_assets(soup, base_url)
+        # Discovery only needs asset-bearing tags; the full DOM is built later for localization
+        assets = collect_assets(BeautifulSoup(raw_html, "lxml", parse_only=ASSET_STRAINER, from_encoding=charset), base_url)
         # Optional limiting for preview/demo
         if limit_per_type is not None and limit_per_type > 0:
             limited: Dict[str, Set[str]] = {}
@@ -827,7 +1064,6 @@ async def download_site(
             log_cb,
             cancel_cb,
             asset_cb,
-            asset_cancel_cb,
         )
 
         # Process CSS secondary assets
@@ -836,6 +1072,8 @@ async def download_site(
                 log_cb("CANCELLED before CSS processing")
             raise asyncio.CancelledError()
         # Use enhanced CSS processing with fallbacks and css_img output
+        # (one transfer budget across all stylesheets of this run)
+        sem = asyncio.Semaphore(MAX_CONCURRENCY)
         await process_css_files_with_fallbacks(
             client,
             mapping_by_type["css"],
@@ -846,31 +1084,39 @@ async def download_site(
             cancel_cb,
             limit_refs=limit_css_refs,
             asset_cb=asset_cb,
-            asset_cancel_cb=asset_cancel_cb,
+            sem=sem,
         )
 
         # Rewrite paths in HTML
+        soup = BeautifulSoup(raw_html, "lxml", from_encoding=charset)
         rewrite_html_paths(soup, base_url, mapping_by_type)
         # Remove responsive srcset attributes to produce a simplified, stable local HTML
         strip_srcset_attributes(soup, log_cb)
         # Remove specific interactive handlers to stabilize the local copy
         strip_onclick_nextpage_attributes(soup, log_cb)
 
+        # Serialize once; the same text feeds local-index.html and content.php
+        local_html = soup.prettify() if pretty_html else soup.decode()
+
         # Save modified HTML to a separate localized file, do not overwrite the raw index.html
         try:
-            local_index_path.write_text(soup.prettify(), encoding="utf-8")
+            local_index_path.write_bytes(local_html.encode("utf-8"))
             if log_cb:
                 log_cb(f"Saved localized page -> {local_index_path.name}")
         except Exception:
             if log_cb:
                 log_cb("WARNING  failed to write local-index.html")
 
-        # Generate PHP content file based on localized or raw HTML
+        # Generate PHP content file from the localized HTML (string ops only, no reparse)
         try:
-            _generate_content_php(folder, product_name, log_cb)
+            _generate_content_php(folder, product_name, local_html, log_cb)
         except Exception:
             if log_cb:
                 log_cb("WARNING  failed to generate content.php")
+    finally:
+        if own_client:
+            await client.aclose()
+        _clear_url_caches()
 
     counts = {k: len(v) for k, v in assets.items()}
     return DownloadResult(
@@ -883,44 +1129,66 @@ async def download_site(
     )
 
 
-def _generate_content_php(folder: Path, product_name: str, log_cb: Optional[Callable[[str], None]] = None) -> Path:
+_TITLE_CLOSE_RE = re.compile(r"</title\s*>", re.IGNORECASE)
+# Raw-text and comment spans; markup-looking text inside them is not part of the DOM
+_HIDDEN_RE = re.compile(r"<script\b.*?</script\s*>|<style\b.*?</style\s*>|<!--.*?-->", re.IGNORECASE | re.DOTALL)
+# Serialized anchors: (<a ...>)(inner html)(</a>), with hidden spans matched first so anchors
+# inside scripts or comments are passed through. bs4 escapes ">" inside attribute values,
+# so [^>]* reliably spans the opening tag.
+_ANCHOR_RE = re.compile(
+    _HIDDEN_RE.pattern + r"|(<a\b[^>]*>)(.*?)(</a\s*>)",
+    re.IGNORECASE | re.DOTALL,
+)
+# One attribute token of a bs4-serialized tag (name, or name="value" / name='value'), so
+# text inside another attribute's value is never read as an attribute
+_ATTR_RE = re.compile(r"""\s([\w:-]+)(?:="[^"]*"|='[^']*')?""")
+_TAG_RE = re.compile(r"<[^>]*>")
+
+
+def _generate_content_php(
+    folder: Path,
+    product_name: str,
+    local_html: str,
+    log_cb: Optional[Callable[[str], None]] = None,
+) -> Path:
     """
-    Create content.php in the given folder by:
+    Create content.php in the given folder from the serialized localized HTML by:
     - Replacing all occurrences of the product name with <?=$productName;?>
     - Updating <a> tags whose visible text contains 'order' (case-insensitive)
       so that href becomes <?php echo $ctaLink; ?>
 
-    We avoid BeautifulSoup escaping PHP in attributes by first writing a placeholder
-    in href and then string-replacing after serialization.
+    Works on the string directly (no DOM). A placeholder is written in href first so the
+    product-name replacement can never touch the PHP snippet.
     """
-    preferred = folder / "local-index.html"
-    fallback = folder / "index.html"
-    src = preferred if preferred.exists() else fallback
-    # If neither exists, raise
-    if not src.exists():
-        raise FileNotFoundError("No HTML source found to generate content.php")
-
-    html = src.read_text(encoding="utf-8", errors="ignore")
-    soup = BeautifulSoup(html, "html.parser")
-
     PLACEHOLDER = "__PHPCTA_LINK__"
 
-    # Modify only anchors with visible text containing 'order'
-    for a in soup.find_all("a"):
-        text = a.get_text(strip=True) or ""
-        if "order" in text.lower():
-            a["href"] = PLACEHOLDER
+    def _rewrite_cta(m: re.Match) -> str:
+        if m.group(1) is None:
+            # <script>/<style> body or comment: leave untouched
+            return m.group(0)
+        # Modify only anchors with visible text containing 'order'
+        text = _TAG_RE.sub("", _HIDDEN_RE.sub("", m.group(2)))
+        if "&" in text:
+            text = html.unescape(text)
+        if "order" not in text.lower():
+            return m.group(0)
+        open_tag = m.group(1)
+        href = f' href="{PLACEHOLDER}"'
+        for attr in _ATTR_RE.finditer(open_tag, 2):
+            if attr.group(1).lower() == "href":
+                open_tag = open_tag[:attr.start()] + href + open_tag[attr.end():]
+                break
+        else:
+            open_tag = open_tag[:-1] + href + ">"
+        return open_tag + m.group(2) + m.group(3)
 
-    # Serialize and apply textual replacements
-    out_html = str(soup)
+    # Rewrite CTA anchors and apply textual replacements
+    out_html = _ANCHOR_RE.sub(_rewrite_cta, local_html)
     if product_name:
         out_html = out_html.replace(product_name, "<?=$productName;?>")
     out_html = out_html.replace(PLACEHOLDER, "<?php echo $ctaLink; ?>")
     # Insert PHP headers snippet right after the </title> closing tag (case-insensitive)
-    try:
-        out_html = re.sub(r'(</title\s*>)', r'\1\n<?= $headers; ?>', out_html, count=1, flags=re.IGNORECASE)
-    except Exception:
-        pass
+    out_html = _TITLE_CLOSE_RE.sub(r"\g<0>\n<?= $headers; ?>", out_html, count=1)
 
     out_path = folder / "content.php"
     out_path.write_text(out_html, encoding="utf-8")
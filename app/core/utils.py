@@ -1,37 +1,60 @@
 from __future__ import annotations
 
+import functools
+import os
 import re
 import unicodedata
 from pathlib import Path
 from typing import Optional
 
-from urllib.parse import urlparse
-
 
 WINDOWS = True
 
+_SLASH_RE = re.compile(r"[\\/]+")
+_NONWORD_RE = re.compile(r"[^\w\s-]")
+_WS_RE = re.compile(r"[\s-]+")
+
 
+@functools.lru_cache(maxsize=1024)  # product names repeat across jobs in a session
 def slugify(value: str, allow_unicode: bool = False) -> str:
     value = str(value)
     if allow_unicode:
         value = unicodedata.normalize("NFKC", value)
     else:
         value = unicodedata.normalize("NFKD", value).encode("ascii", "ignore").decode("ascii")
-    value = re.sub(r"[\\/]+", "-", value)
-    value = re.sub(r"[^\w\s-]", "", value.lower())
-    value = re.sub(r"[\s-]+", "-", value).strip("-")
+    value = _SLASH_RE.sub("-", value)
+    value = _NONWORD_RE.sub("", value.lower())
+    value = _WS_RE.sub("-", value).strip("-")
     return value or "site"
 
 
 def ensure_unique_dir(base: Path, name: str) -> Path:
     base.mkdir(parents=True, exist_ok=True)
     candidate = base / name
+    try:
+        candidate.mkdir(exist_ok=False)
+        return candidate
+    except FileExistsError:
+        pass
+    # Name is taken: list the parent once and continue after the highest "<name>-N"
+    suffix_re = re.compile(re.escape(name) + r"-(\d+)")
     i = 2
-    while candidate.exists():
+    try:
+        with os.scandir(base) as entries:
+            for entry in entries:
+                m = suffix_re.fullmatch(entry.name)
+                if m:
+                    i = max(i, int(m.group(1)) + 1)
+    except OSError:
+        pass
+    # Probe only covers races with a concurrent creator (or a failed listing)
+    while True:
         candidate = base / f"{name}-{i}"
-        i += 1
-    candidate.mkdir(parents=True, exist_ok=False)
-    return candidate
+        try:
+            candidate.mkdir(exist_ok=False)
+            return candidate
+        except FileExistsError:
+            i += 1
 
 
 def safe_join(base: Path, target: Path) -> Path:
@@ -42,30 +65,35 @@ def safe_join(base: Path, target: Path) -> Path:
     return target
 
 
+# "scheme:" (any RFC 3986 scheme, as urlparse would detect it) or protocol-relative "//"
+_ABSOLUTE_URL_RE = re.compile(r"[a-zA-Z][a-zA-Z0-9+.\-]*:|//")
+
+
 def is_relative_url(url: str) -> bool:
-    p = urlparse(url)
-    return not p.scheme and not p.netloc and not url.startswith("//")
+    return _ABSOLUTE_URL_RE.match(url) is None
+
+
+MIME_TO_EXT = {
+    "text/css": ".css",
+    "text/javascript": ".js",
+    "application/javascript": ".js",
+    "application/x-javascript": ".js",
+    "image/jpeg": ".jpg",
+    "image/png": ".png",
+    "image/gif": ".gif",
+    "image/webp": ".webp",
+    "image/svg+xml": ".svg",
+    "video/mp4": ".mp4",
+    "video/webm": ".webm",
+    "font/woff": ".woff",
+    "font/woff2": ".woff2",
+    "font/ttf": ".ttf",
+    "font/otf": ".otf",
+    "application/font-woff": ".woff",
+}
 
 
 def guess_extension_from_mime(mime: Optional[str]) -> str:
     if not mime:
         return ""
-    mapping = {
-        "text/css": ".css",
-        "text/javascript": ".js",
-        "application/javascript": ".js",
-        "application/x-javascript": ".js",
-        "image/jpeg": ".jpg",
-        "image/png": ".png",
-        "image/gif": ".gif",
-        "image/webp": ".webp",
-        "image/svg+xml": ".svg",
-        "video/mp4": ".mp4",
-        "video/webm": ".webm",
-        "font/woff": ".woff",
-        "font/woff2": ".woff2",
-        "font/ttf": ".ttf",
-        "font/otf": ".otf",
-        "application/font-woff": ".woff",
-    }
-    return mapping.get(mime.split(";")[0].strip(), "")
+    return MIME_TO_EXT.get(mime.partition(";")[0].strip(), "")
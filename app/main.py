@@ -1,6 +1,9 @@
 from __future__ import annotations
 
 import asyncio
+import collections
+import concurrent.futures
+import functools
 import os
 import threading
 from pathlib import Path
@@ -11,7 +14,30 @@ from tkinter.scrolledtext import ScrolledText
 
  
 
-from app.core.downloader import download_site
+import httpx
+
+from app.core.downloader import CancelToken, create_client, create_ssl_context, download_site
+
+# Optional faster event loop for the download thread: uvloop (POSIX) or winloop (Windows)
+try:
+    import uvloop
+
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+except ImportError:
+    try:
+        import winloop
+
+        asyncio.set_event_loop_policy(winloop.EventLoopPolicy())
+    except ImportError:
+        pass
+
+
+# Built once per process: each context parses the CA bundle
+_SSL_VERIFY = create_ssl_context(True)
+_SSL_NOVERIFY = create_ssl_context(False)
+
+# Lines kept in the log widget; older lines are dropped as new ones arrive
+LOG_MAX_LINES = 5000
 
 
 def _default_root() -> Path:
@@ -27,6 +53,33 @@ def _default_root() -> Path:
 DEFAULT_ROOT = _default_root()
 
 
+# "MM:SS" for every second within an hour, so HH:MM:SS needs one int format instead of three
+_MMSS = tuple(f"{m:02d}:{s:02d}" for m in range(60) for s in range(60))
+
+
+def _fmt_hms(total: int) -> str:
+    h, rem = divmod(total, 3600)
+    return f"{h:02d}:{_MMSS[rem]}"
+
+
+def _format_asset_progress(read: int, total: int) -> str:
+    if total > 0:
+        return f"{min(100, read * 100 // total)}%"
+    return f"{read // 1024} KB"
+
+
+class _AssetRow:
+    """UI state for one asset transfer shown in the Treeview."""
+
+    __slots__ = ("iid", "total", "finished", "token")
+
+    def __init__(self, iid: str, total: int = 0, token: CancelToken | None = None):
+        self.iid = iid
+        self.total = total
+        self.finished = False
+        self.token = token  # downloader's cancel switch, if it provided one
+
+
 class App(tk.Tk):
     def __init__(self):
         super().__init__()
@@ -51,21 +104,49 @@ class App(tk.Tk):
         self.root_var = tk.StringVar(value=str(DEFAULT_ROOT))
 
         self._last_folder: Path | None = None
-        self._worker: threading.Thread | None = None
+        self._worker: concurrent.futures.Future | None = None
+        self._job_future: concurrent.futures.Future | None = None  # download_site running on self._loop
         self._timer_job: str | None = None
         self._start_ts: float | None = None
         self._progress_stage: str | None = None
+        self._progress_mode: str = "indeterminate"  # matches the Progressbar's initial mode
+        self._last_progress_key: tuple[int, int, str] | None = None  # last (done, total, stage) applied
         self._progress_total: int = 0
         self._progress_done: int = 0
         self._cancel_requested: bool = False
+        self._last_elapsed_str: str = ""
+        self._pending_elapsed: str | None = None  # latest text waiting for _flush_elapsed
         self.preview_var = tk.BooleanVar(value=False)
         self.insecure_ssl_var = tk.BooleanVar(value=True)  # default to ignore for testing today
         # Per-asset UI state
-        self._asset_rows: dict[tuple[str, str], dict] = {}
-        self._asset_cancel_flags: set[tuple[str, str]] = set()
+        self._asset_rows: dict[tuple[str, str], _AssetRow] = {}  # (kind, url) -> row state
+        self._asset_keys: dict[str, tuple[str, str]] = {}  # Treeview iid -> (kind, url)
         self._error_lines: list[str] = []
+        self._log_lines: int = 0  # lines currently in the log widget (at most LOG_MAX_LINES)
+
+        # One event loop (on its own daemon thread) and pooled HTTP clients for the app's lifetime,
+        # so jobs reuse warm connections instead of paying loop setup and TLS handshakes each time
+        self._loop = asyncio.new_event_loop()
+        self._loop_thread = threading.Thread(target=self._loop.run_forever, name="htclone-loop", daemon=True)
+        self._loop_thread.start()
+        self._http_clients: dict[bool, httpx.AsyncClient] = {}  # keyed by verify_ssl; loop thread only
+        # Single reusable worker thread; further jobs queue behind the running one
+        self._exec = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="httclone")
+
+        # Worker -> UI events are queued here and applied in batches by a single ~60 Hz tick,
+        # instead of one Tk after(0, ...) dispatch per callback
+        self._evq: collections.deque = collections.deque()
+        self._evq_lock = threading.Lock()
+        self._drain_job: str | None = None  # pending tick; None while a drain is running
+        self._hidden: bool = False  # window minimized: drain once a second instead of ~60 Hz
+        self._closing: bool = False
 
         self._build_ui()
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
+        # Pause the timer and slow the drain tick while minimized
+        self.bind("<Unmap>", self._on_unmap)
+        self.bind("<Map>", self._on_map)
+        self._schedule_drain()
 
     def _build_ui(self):
         pad = {"padx": 10, "pady": 6}
@@ -102,6 +183,7 @@ class App(tk.Tk):
         # Status
         self.status_var = tk.StringVar(value="Ready.")
         self.status = ttk.Label(frm, textvariable=self.status_var, style="Status.TLabel")
+        self._status_style = "Status.TLabel"
         self.status.grid(row=4, column=0, columnspan=5, sticky=tk.W, **pad)
 
         # Progress bar and elapsed timer
@@ -114,23 +196,23 @@ class App(tk.Tk):
         # Separator
         ttk.Separator(frm, orient="horizontal").grid(row=7, column=0, columnspan=5, sticky=tk.EW, padx=10)
 
-        # Asset transfers (scrollable list)
-        ttk.Label(frm, text="Asset Transfers").grid(row=8, column=0, sticky=tk.W, **pad)
-        self.assets_canvas = tk.Canvas(frm, height=180)
-        self.assets_canvas.grid(row=9, column=0, columnspan=4, sticky=tk.NSEW, **pad)
-        self.assets_scroll = ttk.Scrollbar(frm, orient="vertical", command=self.assets_canvas.yview)
+        # Asset transfers: one Treeview row per asset (rows are data, not widgets)
+        ttk.Label(frm, text="Asset Transfers (double-click to cancel)").grid(row=8, column=0, columnspan=2, sticky=tk.W, **pad)
+        ttk.Button(frm, text="Cancel Selected", command=self._cancel_selected_assets).grid(row=8, column=4, sticky=tk.E, **pad)
+        self.assets_tv = ttk.Treeview(frm, columns=("kind", "url", "pct", "status"), show="headings", height=8)
+        for col, heading, width, stretch in (
+            ("kind", "Type", 70, False),
+            ("url", "URL", 480, True),
+            ("pct", "Progress", 90, False),
+            ("status", "Status", 70, False),
+        ):
+            self.assets_tv.heading(col, text=heading, anchor=tk.W)
+            self.assets_tv.column(col, width=width, stretch=stretch, anchor=tk.W)
+        self.assets_tv.grid(row=9, column=0, columnspan=4, sticky=tk.NSEW, **pad)
+        self.assets_scroll = ttk.Scrollbar(frm, orient="vertical", command=self.assets_tv.yview)
         self.assets_scroll.grid(row=9, column=4, sticky=tk.NS, padx=(0, 10))
-        self.assets_canvas.configure(yscrollcommand=self.assets_scroll.set)
-        self.assets_frame = ttk.Frame(self.assets_canvas)
-        self.assets_window = self.assets_canvas.create_window((0, 0), window=self.assets_frame, anchor="nw")
-        def _on_assets_configure(event):
-            try:
-                self.assets_canvas.configure(scrollregion=self.assets_canvas.bbox("all"))
-                # Make inner frame width follow canvas
-                self.assets_canvas.itemconfigure(self.assets_window, width=self.assets_canvas.winfo_width())
-            except Exception:
-                pass
-        self.assets_frame.bind("<Configure>", _on_assets_configure)
+        self.assets_tv.configure(yscrollcommand=self.assets_scroll.set)
+        self.assets_tv.bind("<Double-1>", self._on_asset_double_click)
 
         # Separator
         ttk.Separator(frm, orient="horizontal").grid(row=10, column=0, columnspan=5, sticky=tk.EW, padx=10)
@@ -163,84 +245,231 @@ class App(tk.Tk):
             messagebox.showerror("Error", "Please enter Product Name and URL.")
             return
 
-        try:
-            root.mkdir(parents=True, exist_ok=True)
-        except Exception as e:
-            messagebox.showerror("Error", f"Cannot create/access folder:\n{root}\n\n{e}")
-            return
-
-        # Disable UI during download
+        # Disable UI during download (before the worker touches the filesystem, so a slow
+        # download root can't be double-submitted)
         self.btn_download.config(state=tk.DISABLED)
         self.btn_cancel.config(state=tk.NORMAL)
         self._cancel_requested = False
         self.status_var.set("Downloading... This may take a while.")
-        try:
-            self.status.configure(style="Status.TLabel")
-        except Exception:
-            pass
+        self._set_status_style("Status.TLabel")
         self.progress.start(10)
+        self._last_progress_key = None
         self._start_timer()
         self._clear_log()
         self._error_lines.clear()
         self._clear_assets()
-        self._asset_cancel_flags.clear()
         start_line = f"Starting job: product='{product}', url='{url}' -> root='{root}'"
         if preview:
             start_line += " [PREVIEW]"
         self._append_log(start_line)
 
         def _worker():
+            # Creating the root can block for seconds on network mounts; keep it off the UI thread
+            try:
+                root.mkdir(parents=True, exist_ok=True)
+            except Exception as e:
+                err = OSError(f"Cannot create/access folder:\n{root}\n\n{e}")
+                self._post_event("call", functools.partial(self._on_download_error, err))
+                return
             try:
-                # Progress callback from worker thread; marshal to UI thread via after()
-                def progress_cb(done: int, total: int, stage: str):
-                    self.after(0, lambda d=done, t=total, s=stage: self._on_progress(d, t, s))
-
-                def log_cb(msg: str):
-                    self.after(0, lambda m=msg: self._append_log(m))
-
-                def cancel_cb() -> bool:
-                    return self._cancel_requested
-
-                def asset_cb(event: str, kind: str, url: str, meta: dict):
-                    # events: start/progress/done/error/cancelled
-                    self.after(0, lambda ev=event, k=kind, u=url, m=meta: self._on_asset_event(ev, k, u, m))
-
-                def asset_cancel_cb(kind: str, url: str) -> bool:
-                    return (kind, url) in self._asset_cancel_flags
-
-                result = asyncio.run(
-                    download_site(
-                        url=url,
-                        product_name=product,
-                        download_root=root,
-                        use_render=False,
-                        progress_cb=progress_cb,
-                        log_cb=log_cb,
-                        cancel_cb=cancel_cb,
-                        asset_cb=asset_cb,
-                        asset_cancel_cb=asset_cancel_cb,
-                        limit_per_type=1 if preview else None,
-                        limit_css_refs=1 if preview else None,
-                        verify_ssl=verify_ssl,
-                    )
-                )
+                async def _job():
+                    # Callbacks run on the loop thread and only enqueue; _pump_events moves the
+                    # events to the UI drain queue in batches, so the lock is taken once per batch
+                    evq: asyncio.Queue = asyncio.Queue()
+                    emit = evq.put_nowait
+                    pump = asyncio.ensure_future(self._pump_events(evq))
+
+                    def progress_cb(done: int, total: int, stage: str):
+                        emit(("progress", done, total, stage))
+
+                    def log_cb(msg: str):
+                        emit(("log", msg))
+
+                    def cancel_cb() -> bool:
+                        return self._cancel_requested
+
+                    # Per-asset progress is throttled to <= 20 Hz before it is queued
+                    last_emit: dict[tuple[str, str], float] = {}
+
+                    def asset_cb(event: str, kind: str, url: str, meta: dict):
+                        # events: start/progress/done/error/cancelled
+                        key = (kind, url)
+                        if event == "progress":
+                            now = time.perf_counter()
+                            if now - last_emit.get(key, 0.0) < 0.05:
+                                return
+                            last_emit[key] = now
+                        elif event in ("done", "error", "cancelled"):
+                            last_emit.pop(key, None)
+                        emit(("asset", event, kind, url, meta))
+
+                    try:
+                        return await download_site(
+                            url=url,
+                            product_name=product,
+                            download_root=root,
+                            use_render=False,
+                            progress_cb=progress_cb,
+                            log_cb=log_cb,
+                            cancel_cb=cancel_cb,
+                            asset_cb=asset_cb,
+                            limit_per_type=1 if preview else None,
+                            limit_css_refs=1 if preview else None,
+                            verify_ssl=verify_ssl,
+                            client=self._get_http_client(verify_ssl),
+                        )
+                    finally:
+                        # Sentinel: the pump hands over whatever is still queued, then exits
+                        emit(None)
+                        await pump
+
+                # The window may have closed (and stopped the loop) while mkdir was blocking
+                if self._closing:
+                    return
+                fut = asyncio.run_coroutine_threadsafe(_job(), self._loop)
+                self._job_future = fut
+                # Poll rather than block: if closing races with scheduling, _on_close may miss
+                # this future, and a coroutine on a stopped loop would never complete
+                while True:
+                    try:
+                        result = fut.result(timeout=0.5)
+                        break
+                    except concurrent.futures.TimeoutError:
+                        if self._closing:
+                            fut.cancel()
                 self._last_folder = result.folder
                 msg = f"Done. Saved index.html and local-index.html to: {result.folder}"
-                self.after(0, lambda: self._on_download_done(msg))
-            except asyncio.CancelledError:
-                self.after(0, self._on_cancelled)
+                # Completion goes through the same queue so it is applied after the job's last logs
+                self._post_event("call", functools.partial(self._on_download_done, msg))
+            except (asyncio.CancelledError, concurrent.futures.CancelledError):
+                self._post_event("call", self._on_cancelled)
             except Exception as e:
-                self.after(0, lambda err=e: self._on_download_error(err))
+                self._post_event("call", functools.partial(self._on_download_error, e))
+
+        self._worker = self._exec.submit(_worker)
+
+    async def _pump_events(self, evq: asyncio.Queue) -> None:
+        # Loop thread: wait for an event, let a UI tick's worth accumulate, then move the batch
+        # to the UI queue under one lock acquisition. A None item ends the pump.
+        while True:
+            batch = [await evq.get()]
+            await asyncio.sleep(0.016)
+            while not evq.empty():
+                batch.append(evq.get_nowait())
+            last = batch[-1] is None
+            if last:
+                batch.pop()
+            if batch:
+                with self._evq_lock:
+                    self._evq.extend(batch)
+            if last:
+                return
 
-        self._worker = threading.Thread(target=_worker, daemon=True)
-        self._worker.start()
+    def _post_event(self, *event) -> None:
+        # Any thread: ("progress", done, total, stage) | ("log", line) | ("asset", event, kind, url, meta) | ("call", fn)
+        with self._evq_lock:
+            self._evq.append(event)
+
+    def _drain_events(self):
+        # This tick has fired; handlers below may schedule the next one themselves (a <Map> or
+        # <Unmap> handled inside a nested event loop such as a messagebox)
+        self._drain_job = None
+        with self._evq_lock:
+            events, self._evq = self._evq, collections.deque()
+        try:
+            if events:
+                # Only the latest progress per asset (and for the overall bar) is worth applying
+                latest: dict = {}
+                for i, ev in enumerate(events):
+                    if ev[0] == "progress":
+                        latest["overall"] = i
+                    elif ev[0] == "asset" and ev[1] == "progress":
+                        latest[(ev[2], ev[3])] = i
+                # Log lines go into the Text widget in one insert per tick (flushed early before a
+                # "call" so completion handlers see the log in order)
+                log_lines: list[str] = []
+                for i, ev in enumerate(events):
+                    tag = ev[0]
+                    if tag == "progress":
+                        if latest["overall"] == i:
+                            self._on_progress(*ev[1:])
+                    elif tag == "log":
+                        log_lines.append(ev[1])
+                    elif tag == "asset":
+                        if ev[1] != "progress" or latest[(ev[2], ev[3])] == i:
+                            self._on_asset_event(*ev[1:])
+                    elif tag == "call":
+                        if log_lines:
+                            self._append_log_lines(log_lines)
+                            log_lines = []
+                        ev[1]()
+                if log_lines:
+                    self._append_log_lines(log_lines)
+        finally:
+            if self._drain_job is None and not self._closing:
+                self._schedule_drain()
+
+    def _schedule_drain(self):
+        # Replaces any pending tick, so there is only ever one drain chain
+        if self._drain_job:
+            self.after_cancel(self._drain_job)
+        # Keep draining while minimized (slowly) so the queue can't grow for the whole job and
+        # then be applied in one go on restore; writes to an unmapped window don't redraw
+        self._drain_job = self.after(1000 if self._hidden else 16, self._drain_events)
+
+    def _on_unmap(self, event):
+        # Children's <Unmap> also reaches the toplevel binding; only react to the window itself
+        if event.widget is not self or self._hidden:
+            return
+        self._hidden = True
+        self._pause_timer()
+        self._schedule_drain()
 
-    def _on_download_done(self, message: str):
-        self.status_var.set(message)
+    def _on_map(self, event):
+        if event.widget is not self or not self._hidden:
+            return
+        self._hidden = False
+        self._resume_timer()
+        self._schedule_drain()
+
+    def _get_http_client(self, verify_ssl: bool) -> httpx.AsyncClient:
+        # Called on the loop thread so the client's connection pool belongs to that loop
+        client = self._http_clients.get(verify_ssl)
+        if client is None:
+            client = create_client(verify_ssl, _SSL_VERIFY if verify_ssl else _SSL_NOVERIFY)
+            self._http_clients[verify_ssl] = client
+        return client
+
+    def _on_close(self):
+        self._closing = True
+        if self._drain_job:
+            try:
+                self.after_cancel(self._drain_job)
+            except Exception:
+                pass
+            self._drain_job = None
+
+        async def _close_clients():
+            clients = list(self._http_clients.values())
+            self._http_clients.clear()
+            for client in clients:
+                await client.aclose()
+
+        # Abort a running job so the worker thread isn't left waiting on a stopped loop
+        self._cancel_requested = True
+        if self._job_future is not None:
+            self._job_future.cancel()
+        self._exec.shutdown(wait=False, cancel_futures=True)
         try:
-            self.status.configure(style="StatusOk.TLabel")
+            asyncio.run_coroutine_threadsafe(_close_clients(), self._loop).result(timeout=2)
         except Exception:
             pass
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self.destroy()
+
+    def _on_download_done(self, message: str):
+        self.status_var.set(message)
+        self._set_status_style("StatusOk.TLabel")
         self.progress.stop()
         self._stop_timer()
         self.btn_download.config(state=tk.NORMAL)
@@ -248,7 +477,7 @@ class App(tk.Tk):
         self._cancel_requested = False
         # Reset progress bar for next run
         try:
-            self.progress.config(mode="indeterminate", value=0)
+            self._set_progress_mode("indeterminate", value=0)
         except Exception:
             pass
         # Append error summary for easy copy
@@ -256,10 +485,7 @@ class App(tk.Tk):
 
     def _on_download_error(self, e: Exception):
         self.status_var.set("Error during download.")
-        try:
-            self.status.configure(style="StatusError.TLabel")
-        except Exception:
-            pass
+        self._set_status_style("StatusError.TLabel")
         self.progress.stop()
         self._stop_timer()
         self.btn_download.config(state=tk.NORMAL)
@@ -268,7 +494,7 @@ class App(tk.Tk):
         self._cancel_requested = False
         # Reset progress bar for next run
         try:
-            self.progress.config(mode="indeterminate", value=0)
+            self._set_progress_mode("indeterminate", value=0)
         except Exception:
             pass
         # Append error summary for easy copy
@@ -277,30 +503,17 @@ class App(tk.Tk):
     def _on_asset_event(self, event: str, kind: str, url: str, meta: dict):
         key = (kind, url)
         row = self._asset_rows.get(key)
+        if not isinstance(meta, dict):
+            meta = {}
         if event == "start":
             if row is not None:
                 return
-            # Build a row: kind, url, progress bar, cancel button
-            row_frm = ttk.Frame(self.assets_frame)
-            row_frm.pack(fill=tk.X, padx=4, pady=2)
-            lbl_kind = ttk.Label(row_frm, text=f"[{kind}]", width=6)
-            lbl_kind.pack(side=tk.LEFT)
-            lbl_url = ttk.Label(row_frm, text=url, width=60)
-            lbl_url.pack(side=tk.LEFT, padx=(6, 6))
-            total = meta.get("total") if isinstance(meta, dict) else None
-            pb = ttk.Progressbar(row_frm, style="Green.Horizontal.TProgressbar")
-            if total and isinstance(total, int) and total > 0:
-                pb.config(mode="determinate", maximum=total, value=0)
-            else:
-                pb.config(mode="indeterminate")
-                try:
-                    pb.start(15)
-                except Exception:
-                    pass
-            pb.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(0, 6))
-            btn = ttk.Button(row_frm, text="Cancel", command=lambda k=kind, u=url: self._asset_cancel(k, u))
-            btn.pack(side=tk.RIGHT)
-            self._asset_rows[key] = {"frame": row_frm, "pb": pb, "btn": btn, "total": (total or 0), "read": 0}
+            total = meta.get("total")
+            total = total if isinstance(total, int) and total > 0 else 0
+            iid = self.assets_tv.insert("", tk.END, values=(kind, url, "0%" if total else "", ""))
+            token = meta.get("token")
+            self._asset_rows[key] = _AssetRow(iid, total, token if isinstance(token, CancelToken) else None)
+            self._asset_keys[iid] = key
         elif event == "progress":
             if row is None:
                 # initialize if missing
@@ -308,54 +521,32 @@ class App(tk.Tk):
                 row = self._asset_rows.get(key)
             if not row:
                 return
-            total = meta.get("total") if isinstance(meta, dict) else None
-            read = meta.get("read") if isinstance(meta, dict) else None
+            total = meta.get("total")
+            read = meta.get("read")
             if total and isinstance(total, int) and total > 0:
-                try:
-                    row["pb"].stop()
-                except Exception:
-                    pass
-                row["pb"].config(mode="determinate", maximum=total)
+                row.total = total
             if read and isinstance(read, int):
                 try:
-                    row["pb"]["value"] = read
+                    self.assets_tv.set(row.iid, "pct", _format_asset_progress(read, row.total))
                 except Exception:
                     pass
         elif event in ("done", "error", "cancelled"):
             if row is None:
                 return
+            row.finished = True
+            suffix = {"done": "✓", "error": "✗", "cancelled": "✖"}[event]
             try:
-                row["pb"].stop()
-            except Exception:
-                pass
-            if event == "done":
-                # fill bar if determinate
-                try:
-                    if str(row["pb"].cget("mode")) == "determinate":
-                        row["pb"]["value"] = row["pb"].cget("maximum")
-                except Exception:
-                    pass
-            # disable cancel button
-            try:
-                row["btn"].config(state=tk.DISABLED)
-            except Exception:
-                pass
-            # annotate url label for status
-            try:
-                for child in row["frame"].winfo_children():
-                    if isinstance(child, ttk.Label) and child.cget("text") == url:
-                        suffix = {"done": "✓", "error": "✗", "cancelled": "✖"}[event]
-                        child.config(text=f"{url}  {suffix}")
-                        break
+                if event == "done" and row.total:
+                    # One item update for both columns (kind/url are already known here)
+                    self.assets_tv.item(row.iid, values=(kind, url, "100%", suffix))
+                else:
+                    self.assets_tv.set(row.iid, "status", suffix)
             except Exception:
                 pass
 
     def _on_cancelled(self):
         self.status_var.set("Cancelled by user.")
-        try:
-            self.status.configure(style="Status.TLabel")
-        except Exception:
-            pass
+        self._set_status_style("Status.TLabel")
         self.progress.stop()
         self._stop_timer()
         self.btn_download.config(state=tk.NORMAL)
@@ -363,20 +554,41 @@ class App(tk.Tk):
         self._cancel_requested = False
         # Reset progress bar for next run
         try:
-            self.progress.config(mode="indeterminate", value=0)
+            self._set_progress_mode("indeterminate", value=0)
         except Exception:
             pass
         # Append error summary for easy copy
         self._append_error_summary()
 
+    def _set_status_style(self, style: str):
+        # Re-applying the same style still makes Tk re-resolve it; skip when unchanged
+        if style != self._status_style:
+            try:
+                self.status.configure(style=style)
+            except Exception:
+                return
+            self._status_style = style
+
+    def _set_progress_mode(self, mode: str, **options):
+        # self._progress_mode mirrors the widget so hot paths don't need a cget round-trip
+        if self._progress_mode != mode:
+            self._progress_mode = mode
+            options["mode"] = mode
+        if options:
+            self.progress.config(**options)
+
     def _on_progress(self, done: int, total: int, stage: str):
+        key = (done, total, stage)
+        if key == self._last_progress_key:
+            return
+        self._last_progress_key = key
         # Switch to determinate mode on first progress
-        if str(self.progress.cget("mode")) != "determinate":
+        if self._progress_mode != "determinate":
             try:
                 self.progress.stop()
             except Exception:
                 pass
-            self.progress.config(mode="determinate", maximum=max(1, total), value=done)
+            self._set_progress_mode("determinate", maximum=max(1, total), value=done)
         else:
             # If stage changes, reset maximum to new total
             if self._progress_stage != stage:
@@ -390,56 +602,53 @@ class App(tk.Tk):
         except Exception:
             pass
 
-        # Compute percent and ETA
-        percent = 0
-        if total > 0:
-            percent = int((done / total) * 100)
-
-        # Elapsed
-        elapsed_s = 0
-        if self._start_ts is not None:
-            elapsed_s = int(time.perf_counter() - self._start_ts)
-        hrs, rem = divmod(elapsed_s, 3600)
-        mins, secs = divmod(rem, 60)
-        elapsed_str = f"{hrs:02d}:{mins:02d}:{secs:02d}"
+        elapsed_s = int(time.perf_counter() - self._start_ts) if self._start_ts is not None else 0
+        self._queue_elapsed(self._format_progress_line(elapsed_s, done, total, stage))
 
+    @staticmethod
+    def _format_progress_line(elapsed_s: int, done: int, total: int, stage: str | None) -> str:
+        elapsed_str = _fmt_hms(elapsed_s)
+        if stage is None:
+            return f"Elapsed: {elapsed_str}"
+        percent = int((done / total) * 100) if total > 0 else 0
         # ETA: naive proportional estimate
         eta_str = "--:--:--"
         if total > 0 and done > 0:
-            remain = int(elapsed_s * (total / done - 1))
-            rhrs, rrem = divmod(max(0, remain), 3600)
-            rm_m, rm_s = divmod(rrem, 60)
-            eta_str = f"{rhrs:02d}:{rm_m:02d}:{rm_s:02d}"
-
-        self.elapsed_var.set(f"Stage: {stage} • {percent}% • Elapsed: {elapsed_str} • ETA: {eta_str}")
+            eta_str = _fmt_hms(max(0, int(elapsed_s * (total / done - 1))))
+        return f"Stage: {stage} • {percent}% • Elapsed: {elapsed_str} • ETA: {eta_str}"
+
+    def _queue_elapsed(self, text: str):
+        # Several updates in one event-loop pass (drain tick + timer tick) collapse into a
+        # single StringVar write when Tk goes idle
+        first = self._pending_elapsed is None
+        self._pending_elapsed = text
+        if first:
+            self.after_idle(self._flush_elapsed)
+
+    def _flush_elapsed(self):
+        text, self._pending_elapsed = self._pending_elapsed, None
+        # Skip the Tk variable trace + label relayout when the text hasn't changed
+        if text is not None and text != self._last_elapsed_str:
+            self._last_elapsed_str = text
+            self.elapsed_var.set(text)
 
     def _start_timer(self):
         self._start_ts = time.perf_counter()
-        self.elapsed_var.set("Elapsed: 00:00:00")
+        self._queue_elapsed("Elapsed: 00:00:00")
         self._schedule_timer_tick()
 
     def _schedule_timer_tick(self):
         if self._start_ts is None:
             return
         elapsed = int(time.perf_counter() - self._start_ts)
-        hrs, rem = divmod(elapsed, 3600)
-        mins, secs = divmod(rem, 60)
-        mode = str(self.progress.cget("mode"))
-        if mode == "determinate" and self._progress_total > 0:
-            percent = int((self._progress_done / self._progress_total) * 100) if self._progress_done > 0 else 0
-            # ETA recompute
-            eta_str = "--:--:--"
-            if self._progress_done > 0:
-                remain = int(elapsed * (self._progress_total / self._progress_done - 1))
-                rhrs, rrem = divmod(max(0, remain), 3600)
-                rm_m, rm_s = divmod(rrem, 60)
-                eta_str = f"{rhrs:02d}:{rm_m:02d}:{rm_s:02d}"
-            self.elapsed_var.set(
-                f"Stage: {self._progress_stage} • {percent}% • Elapsed: {hrs:02d}:{mins:02d}:{secs:02d} • ETA: {eta_str}"
-            )
+        determinate = self._progress_mode == "determinate"
+        if determinate and self._progress_total > 0:
+            line = self._format_progress_line(elapsed, self._progress_done, self._progress_total, self._progress_stage)
         else:
-            self.elapsed_var.set(f"Elapsed: {hrs:02d}:{mins:02d}:{secs:02d}")
-        self._timer_job = self.after(500, self._schedule_timer_tick)
+            line = self._format_progress_line(elapsed, 0, 0, None)
+        self._queue_elapsed(line)
+        # Tick faster only while a percentage/ETA is on screen; plain elapsed changes once a second
+        self._timer_job = self.after(250 if determinate else 1000, self._schedule_timer_tick)
 
     def _cancel_download(self):
         if not self._cancel_requested:
@@ -450,39 +659,60 @@ class App(tk.Tk):
 
     def _asset_cancel(self, kind: str, url: str):
         key = (kind, url)
-        self._asset_cancel_flags.add(key)
         row = self._asset_rows.get(key)
-        if row:
-            try:
-                row["btn"].config(state=tk.DISABLED)
-            except Exception:
-                pass
-            # annotate
-            try:
-                for child in row["frame"].winfo_children():
-                    if isinstance(child, ttk.Label) and child.cget("text") == url:
-                        child.config(text=f"{url}  (cancelling…)")
-                        break
-            except Exception:
-                pass
-
-    def _append_log(self, line: str):
-        # Collect errors/warnings for summary
+        if row is None or row.finished:
+            return
+        if row.token is not None:
+            row.token.flag = True
         try:
-            upper = (line or "").strip().upper()
-            if upper.startswith("ERROR") or upper.startswith("WARNING"):
-                self._error_lines.append(line)
+            self.assets_tv.set(row.iid, "status", "cancelling…")
         except Exception:
             pass
+
+    def _cancel_selected_assets(self):
+        for iid in self.assets_tv.selection():
+            key = self._asset_keys.get(iid)
+            if key:
+                self._asset_cancel(*key)
+
+    def _on_asset_double_click(self, event):
+        key = self._asset_keys.get(self.assets_tv.identify_row(event.y))
+        if key:
+            self._asset_cancel(*key)
+
+    def _append_log(self, line: str):
+        self._append_log_lines([line])
+
+    def _append_log_lines(self, lines: list[str]):
+        # Collect errors/warnings for summary
+        for line in lines:
+            try:
+                upper = (line or "").strip().upper()
+                if upper.startswith("ERROR") or upper.startswith("WARNING"):
+                    self._error_lines.append(line)
+            except Exception:
+                pass
+        self._write_log(lines)
+
+    def _write_log(self, lines: list[str]):
+        # Track the widget's line count ourselves, so the overflow to trim from the top is known
+        # exactly without asking Tk to count lines
+        text = "\n".join(lines[-LOG_MAX_LINES:]) + "\n"
+        added = text.count("\n")  # a message may span several lines
+        dropped = max(0, self._log_lines + added - LOG_MAX_LINES)
+        self._log_lines = min(LOG_MAX_LINES, self._log_lines + added)
         try:
             self.log.config(state="normal")
-            self.log.insert(tk.END, line + "\n")
+            self.log.insert(tk.END, text)
+            if dropped:
+                self.log.delete("1.0", f"{dropped + 1}.0")
             self.log.see(tk.END)
             self.log.config(state="disabled")
         except Exception:
             pass
 
     def _clear_log(self):
+        self._log_lines = 0
         try:
             self.log.config(state="normal")
             self.log.delete("1.0", tk.END)
@@ -492,24 +722,18 @@ class App(tk.Tk):
 
     def _clear_assets(self):
         try:
-            for child in list(self.assets_frame.winfo_children()):
-                child.destroy()
-            self._asset_rows.clear()
+            self.assets_tv.delete(*self.assets_tv.get_children())
         except Exception:
             pass
+        self._asset_rows.clear()
+        self._asset_keys.clear()
 
     def _append_error_summary(self):
         try:
             if not self._error_lines:
                 return
-            # Write directly to the log to avoid re-collecting duplicates
-            self.log.config(state="normal")
-            self.log.insert(tk.END, "\n")
-            self.log.insert(tk.END, f"----- Error Summary ({len(self._error_lines)}) -----\n")
-            for l in self._error_lines:
-                self.log.insert(tk.END, l + "\n")
-            self.log.see(tk.END)
-            self.log.config(state="disabled")
+            # Bypass _append_log_lines to avoid re-collecting duplicates
+            self._write_log(["", f"----- Error Summary ({len(self._error_lines)}) -----", *self._error_lines])
         except Exception:
             pass
 
@@ -523,6 +747,15 @@ class App(tk.Tk):
         except Exception:
             messagebox.showerror("Copy Errors", "Failed to copy errors to clipboard.")
 
+    def _pause_timer(self):
+        if self._timer_job:
+            self.after_cancel(self._timer_job)
+            self._timer_job = None
+
+    def _resume_timer(self):
+        if self._start_ts is not None and not self._timer_job:
+            self._schedule_timer_tick()
+
     def _stop_timer(self):
         if self._timer_job:
             try:
@@ -0,0 +1,40 @@
+import pytest
+
+from app.core import downloader
+from app.core.downloader import _AssetFile
+
+
+@pytest.fixture
+def no_tmpfile(monkeypatch):
+    monkeypatch.setattr(downloader, "_use_tmpfile", False)
+
+
+def test_two_writers_same_path_do_not_interleave(tmp_path, no_tmpfile):
+    out = tmp_path / "bg.png"
+    a = _AssetFile(out)
+    b = _AssetFile(out)
+    assert a.part_path != b.part_path
+    a.write(b"A" * 10)
+    b.write(b"B" * 2)
+    a.commit()
+    assert out.read_bytes() == b"A" * 10
+    b.commit()
+    assert out.read_bytes() == b"B" * 2
+    assert list(tmp_path.iterdir()) == [out]
+
+
+def test_discard_leaves_nothing(tmp_path, no_tmpfile):
+    out = tmp_path / "x.css"
+    with _AssetFile(out) as dest:
+        dest.write(b"partial")
+        dest.discard()
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_error_in_context_discards(tmp_path, no_tmpfile):
+    out = tmp_path / "x.js"
+    with pytest.raises(RuntimeError):
+        with _AssetFile(out) as dest:
+            dest.write(b"partial")
+            raise RuntimeError
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,50 @@
+from app.core.downloader import _generate_content_php
+
+CTA = "<?php echo $ctaLink; ?>"
+
+
+def _render(tmp_path, body: str, product_name: str = "") -> str:
+    html = f"<html><head><title>t</title></head><body>{body}</body></html>"
+    return _generate_content_php(tmp_path, product_name, html).read_text(encoding="utf-8")
+
+
+def test_rewrites_order_anchor_href(tmp_path):
+    out = _render(tmp_path, '<a class="btn" href="/buy">Order <b>now</b></a><a href="/faq">FAQ</a>')
+    assert f'<a class="btn" href="{CTA}">Order <b>now</b></a>' in out
+    assert '<a href="/faq">FAQ</a>' in out
+
+
+def test_adds_href_when_missing(tmp_path):
+    out = _render(tmp_path, '<a class="btn">Order</a>')
+    assert f'<a class="btn" href="{CTA}">Order</a>' in out
+
+
+def test_script_anchor_left_untouched(tmp_path):
+    script = '<script>document.write("<a href=\\"/buy\\">Order now</a>");</script>'
+    out = _render(tmp_path, script)
+    assert script in out
+    assert CTA not in out
+
+
+def test_style_and_comment_anchors_left_untouched(tmp_path):
+    body = '<style>/* <a href="/x">order</a> */</style><!-- <a href="/buy">Order now</a> -->'
+    out = _render(tmp_path, body)
+    assert body in out
+    assert CTA not in out
+
+
+def test_href_inside_other_attribute_value_ignored(tmp_path):
+    out = _render(tmp_path, '<a title="see href=x" href="/buy">Order</a>')
+    assert f'<a title="see href=x" href="{CTA}">Order</a>' in out
+
+
+def test_single_quoted_attribute_value(tmp_path):
+    out = _render(tmp_path, """<a title='say " href=x' href="/buy">Order</a>""")
+    assert f"""<a title='say " href=x' href="{CTA}">Order</a>""" in out
+
+
+def test_product_name_and_headers(tmp_path):
+    out = _render(tmp_path, '<p>Aqua Vital</p><a href="/buy">Order Aqua Vital</a>', "Aqua Vital")
+    assert "<p><?=$productName;?></p>" in out
+    assert f'<a href="{CTA}">Order <?=$productName;?></a>' in out
+    assert "</title>\n<?= $headers; ?>" in out
@@ -0,0 +1,49 @@
+from app.core.downloader import _group_css_refs, extract_css_refs, rewrite_css_refs
+
+CSS_URL = "http://h/css/s.css"
+
+
+def test_group_css_refs_by_resolved_url():
+    refs = ["../img/bg.png", "/img/bg.png", "a.png", "a.png", "data:image/png;base64,AA"]
+    assert _group_css_refs(CSS_URL, refs) == [["../img/bg.png", "/img/bg.png"], ["a.png"]]
+
+
+def test_group_css_refs_relative_ref_leads_group():
+    refs = ["http://h/fonts/f.woff2", "../fonts/f.woff2"]
+    assert _group_css_refs(CSS_URL, refs) == [["../fonts/f.woff2", "http://h/fonts/f.woff2"]]
+
+
+def test_extract_css_refs_in_order_with_duplicates():
+    css = """@import url("base.css");
+@import 'print.css' print;
+a { background: url( ../img/a.png ) }
+b { background-image: url('b.png'), url("a.png") }
+@font-face { src: url(../fonts/f.woff2) format("woff2") }
+@media (min-width: 1px) { c { background: url(b.png) } }"""
+    assert extract_css_refs(css) == [
+        "base.css",
+        "print.css",
+        "../img/a.png",
+        "b.png",
+        "a.png",
+        "../fonts/f.woff2",
+        "b.png",
+    ]
+
+
+def test_extract_css_refs_skips_comments():
+    css = "/* url(commented.png) */ a{background:url(x.png)} /* @import 'y.css'; */ /* url(tail.png)"
+    assert extract_css_refs(css) == ["x.png"]
+
+
+def test_rewrite_css_refs_per_token():
+    css = "@import 'a.css'; p{background:url(a.png)} q{background:url(\"a.png.bak\")}"
+    out = rewrite_css_refs(css, {"a.css": "../css_img/a.css", "a.png": "../img/a.png"})
+    assert out == (
+        "@import url('../css_img/a.css'); p{background:url('../img/a.png')} q{background:url(\"a.png.bak\")}"
+    )
+
+
+def test_rewrite_css_refs_leaves_comments():
+    css = "/* url(x.png) */ a{background:url(x.png)}"
+    assert rewrite_css_refs(css, {"x.png": "../img/x.png"}) == "/* url(x.png) */ a{background:url('../img/x.png')}"